@@ -9,7 +9,7 @@ def load_airflow_secrets() -> dict:
     return {
         "aws_access_key": aws_secret["aws_access_key"],
         "aws_secret_key": aws_secret["aws_secret_key"],
-        "sf_username": sf_secret["sf_username"],
+        "sf_user": sf_secret["sf_username"],
         "sf_password": sf_secret["sf_password"],
         "sf_account": sf_secret["sf_account"]
     }
@@ -25,12 +25,10 @@ def load_k8_config(config_json: dict) -> dict:
 
         "count_local_script_path": k8["count_script"]["local_path"],
         "count_remote_script_path": k8["count_script"]["remote_path"],
-        "count_tmp_local_config_path": k8["count_script"]["tmp_local_config_path"],
         "count_remote_config_path": k8["count_script"]["remote_config_path"],
 
         "parser_local_script_path": k8["parser_script"]["local_path"],
         "parser_remote_script_path": k8["parser_script"]["remote_path"],
-        "parser_tmp_local_config_path": k8["parser_script"]["tmp_local_config_path"],
         "parser_remote_config_path": k8["parser_script"]["remote_config_path"]
     }
 
@@ -38,7 +36,8 @@ def load_aws_config(config_json: dict) -> dict:
     aws = config_json["aws_details"]
     return {
         "s3_bucket": aws["s3_bucket"],
-        "s3_prefix_base": aws["s3_prefix_base"]
+        "s3_prefix_base": aws["s3_prefix_base"],
+        "s3_region": aws.get("s3_region")
     }
 
 def load_sf_config(config_json: dict) -> dict:
@@ -54,9 +53,12 @@ def load_sf_config(config_json: dict) -> dict:
     }
 
 
+def load_raw_config(json_path: str) -> dict:
+    return json.loads(Path(json_path).read_bytes())
+
+
 def load_config_from_json(json_path: str) -> dict:
-    with open(Path(json_path)) as f:
-        raw_config = json.load(f)
+    raw_config = load_raw_config(json_path)
 
     final_config = {}
     final_config.update(load_pipeline_settings(raw_config))            # e.g. pipeline_name, index_name, timezone
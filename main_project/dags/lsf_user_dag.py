@@ -1,5 +1,4 @@
 import os
-import json
 
 import pendulum
 from airflow import DAG
@@ -11,13 +10,12 @@ from airflow.operators.python import PythonOperator
 DAG_FOLDER   = os.path.dirname(__file__)
 CONFIG_PATH  = os.path.join(DAG_FOLDER, "main_project", "config.json")
 
-with open(CONFIG_PATH) as f:
-    raw_config = json.load(f)
+from main_project.config_handler import load_raw_config, load_pipeline_settings
+raw_config = load_raw_config(CONFIG_PATH)
 
 # ——————————————————————————————————————————————
 # 2. Extract pipeline_settings via your handler
 # ——————————————————————————————————————————————
-from main_project.config_handler import load_pipeline_settings
 pipeline_cfg    = load_pipeline_settings(raw_config)
 timezone_str    = pipeline_cfg.get("timezone", "UTC")
 max_retries     = pipeline_cfg.get("max_retry_attempts", 3)
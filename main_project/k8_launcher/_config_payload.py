@@ -0,0 +1,17 @@
+import json
+
+
+def serialize_config(config_dict: dict) -> bytes:
+    """
+    Returns the JSON bytes uploaded as the remote job config.
+
+    Encoded fresh on every call, so the pod always receives the config as it is
+    now; the encode is negligible next to the SSH round trip.
+
+    Args:
+        config_dict (dict): Flat pipeline config.
+
+    Returns:
+        bytes: Compact UTF-8 JSON encoding of config_dict.
+    """
+    return json.dumps(config_dict, separators=(",", ":")).encode()
@@ -0,0 +1,104 @@
+import stat
+import posixpath
+from contextlib import ExitStack
+
+from airflow.exceptions import AirflowException
+
+from main_project.k8_launcher._config_payload import serialize_config
+from main_project.k8_launcher._remote_exec import run_remote_command
+from main_project.k8_launcher._ssh_pool import get_shared_client, get_shared_sftp
+
+
+def _ensure_remote_dir(sftp, remote_dir: str):
+    # SFTP equivalent of mkdir -p: one stat when the directory already exists,
+    # parents created as needed, and any other failure (e.g. permissions) raised
+    try:
+        if stat.S_ISDIR(sftp.stat(remote_dir).st_mode):
+            return
+        raise AirflowException(f"Remote path exists and is not a directory: {remote_dir}")
+    except FileNotFoundError:
+        pass
+
+    parent = posixpath.dirname(remote_dir.rstrip("/"))
+    if parent and parent != remote_dir:
+        _ensure_remote_dir(sftp, parent)
+    sftp.mkdir(remote_dir)
+
+
+def prepare_script_launch(config_dict: dict, kind: str):
+    """
+    Does the connection and local setup of a K8 script launch ahead of time.
+
+    Opens (or health-checks) the shared SSH client and SFTP channel, so a later
+    send_and_run_script for the same kind only has to read the script, encode
+    the config, upload and run. Meant to be called while the pipeline is
+    otherwise idle, e.g. during the Snowflake ingestion wait.
+
+    Args:
+        config_dict (dict): Flat pipeline config; see send_and_run_script for required keys.
+        kind (str): Job kind, used as the config key prefix ("count" or "parser").
+    """
+    ssh_conn_id = config_dict["ssh_conn_id"]
+    get_shared_client(ssh_conn_id)
+    get_shared_sftp(ssh_conn_id)
+    print(f"[INFO] Prepared {kind} launch on: {ssh_conn_id}")
+
+
+def send_and_run_script(config_dict: dict, kind: str, *, remove_workdir: bool):
+    """
+    Uploads a K8 job script and its config to the pod over SSH, runs it there, and cleans up.
+
+    Args:
+        config_dict (dict): Flat pipeline config. Required keys:
+            - ssh_conn_id
+            - remote_working_dir
+            - <kind>_local_script_path, <kind>_remote_script_path
+            - <kind>_remote_config_path
+        kind (str): Job kind, used as the config key prefix ("count" or "parser").
+        remove_workdir (bool): Also remove the remote working directory after the run.
+
+    Raises:
+        AirflowException: If the remote script exits with a non-zero status.
+    """
+    label = kind.capitalize()
+    ssh_conn_id = config_dict["ssh_conn_id"]
+    remote_working_dir = config_dict["remote_working_dir"]
+    local_script_path = config_dict[f"{kind}_local_script_path"]
+    remote_script_path = config_dict[f"{kind}_remote_script_path"]
+    remote_config_path = config_dict[f"{kind}_remote_config_path"]
+
+    ssh_client = get_shared_client(ssh_conn_id)
+    sftp = get_shared_sftp(ssh_conn_id)
+
+    _ensure_remote_dir(sftp, remote_working_dir)
+
+    with open(local_script_path, "rb") as f:
+        script_bytes = f.read()
+    # The config is already in memory; send it straight to the remote file
+    config_bytes = serialize_config(config_dict)
+
+    # Pipelined writes don't wait for a server ACK per packet; both files are
+    # written before either is closed so their window fills overlap. The
+    # ExitStack closes every handle that was opened, even if an open or a close
+    # (where pipelined write errors surface) fails.
+    with ExitStack() as stack:
+        for remote_path, payload in ((remote_script_path, script_bytes), (remote_config_path, config_bytes)):
+            remote_file = stack.enter_context(sftp.file(remote_path, "wb"))
+            remote_file.set_pipelined(True)
+            remote_file.write(payload)
+    print(f"[INFO] Uploaded {kind} script and config to: {remote_working_dir}")
+
+    cleanup = f"rm -f {remote_script_path} {remote_config_path}"
+    if remove_workdir:
+        cleanup += f"; rm -rf {remote_working_dir}"
+
+    # Run and clean up in one channel; rc carries the script's exit code back out
+    exit_code = run_remote_command(
+        ssh_client,
+        f"python3 {remote_script_path} --config {remote_config_path}; rc=$?; {cleanup}; exit $rc"
+    )
+
+    if exit_code != 0:
+        raise AirflowException(f"{label} job failed in K8 with exit code {exit_code}")
+
+    print(f"[INFO] {label} job completed in K8.")
@@ -0,0 +1,39 @@
+import codecs
+import select
+import sys
+
+
+def run_remote_command(ssh_client, command: str) -> int:
+    """
+    Runs a command on the K8 pod and streams its stdout/stderr into the task log as it arrives.
+
+    Both streams are drained from the same loop, so a chatty stderr can't fill its
+    window and stall the remote process while stdout is being read.
+
+    Args:
+        ssh_client (paramiko.SSHClient): Connected SSH client.
+        command (str): Shell command to run remotely.
+
+    Returns:
+        int: Exit status of the remote command.
+    """
+    out_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    err_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    chan = ssh_client.get_transport().open_session()
+    try:
+        chan.exec_command(command)
+        while True:
+            if chan.recv_ready():
+                print(out_decoder.decode(chan.recv(65536)), end="", flush=True)
+            if chan.recv_stderr_ready():
+                print(err_decoder.decode(chan.recv_stderr(65536)), end="", file=sys.stderr, flush=True)
+            if chan.exit_status_ready() and not chan.recv_ready() and not chan.recv_stderr_ready():
+                break
+            select.select([chan], [], [], 1.0)
+
+        print(out_decoder.decode(b"", final=True), end="")
+        print(err_decoder.decode(b"", final=True), end="", file=sys.stderr)
+        return chan.recv_exit_status()
+    finally:
+        chan.close()
@@ -0,0 +1,81 @@
+import atexit
+import threading
+
+from airflow.providers.ssh.hooks.ssh import SSHHook
+
+_LOCK = threading.Lock()
+_POOL = {}
+
+
+def _is_active(client) -> bool:
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+def _close_entry(entry: dict):
+    try:
+        if entry.get("sftp") is not None:
+            entry["sftp"].close()
+        entry["client"].close()
+    except Exception:
+        pass
+
+
+def _get_entry(ssh_conn_id: str) -> dict:
+    entry = _POOL.get(ssh_conn_id)
+    if entry is not None and _is_active(entry["client"]):
+        return entry
+
+    if entry is not None:
+        print(f"[WARN] Shared SSH connection for '{ssh_conn_id}' is no longer active. Reconnecting.")
+        _close_entry(entry)
+
+    client = SSHHook(ssh_conn_id=ssh_conn_id).get_conn()
+    client.get_transport().set_keepalive(30)
+    entry = {"client": client, "sftp": None}
+    _POOL[ssh_conn_id] = entry
+    print(f"[INFO] Opened shared SSH connection for: {ssh_conn_id}")
+    return entry
+
+
+def get_shared_client(ssh_conn_id: str):
+    """
+    Returns a cached paramiko SSHClient for the given Airflow SSH connection id.
+
+    The client is created once per process and reused by every launcher, so
+    the TCP + SSH handshake is only paid on the first call or after the
+    transport has dropped.
+
+    Args:
+        ssh_conn_id (str): Airflow connection id of the K8 SSH endpoint.
+
+    Returns:
+        paramiko.SSHClient: A live, shared SSH client. Callers must not close it.
+    """
+    with _LOCK:
+        return _get_entry(ssh_conn_id)["client"]
+
+
+def get_shared_sftp(ssh_conn_id: str):
+    """
+    Returns the SFTP channel cached alongside the shared SSH client.
+
+    Args:
+        ssh_conn_id (str): Airflow connection id of the K8 SSH endpoint.
+
+    Returns:
+        paramiko.SFTPClient: A shared SFTP channel. Callers must not close it.
+    """
+    with _LOCK:
+        entry = _get_entry(ssh_conn_id)
+        if entry["sftp"] is None:
+            entry["sftp"] = entry["client"].open_sftp()
+        return entry["sftp"]
+
+
+@atexit.register
+def close_all_clients():
+    with _LOCK:
+        for entry in _POOL.values():
+            _close_entry(entry)
+        _POOL.clear()
@@ -0,0 +1,11 @@
+from main_project.k8_launcher._launch import send_and_run_script
+
+
+def send_and_run_count_in_k8(config_dict: dict):
+    """
+    Uploads the record counting script and its config to the K8 pod over SSH and runs it there.
+
+    Args:
+        config_dict (dict): Flat pipeline config; see send_and_run_script for required keys.
+    """
+    send_and_run_script(config_dict, "count", remove_workdir=False)
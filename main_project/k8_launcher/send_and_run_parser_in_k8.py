@@ -0,0 +1,23 @@
+from main_project.k8_launcher._launch import prepare_script_launch, send_and_run_script
+
+
+def send_and_run_parser_in_k8(config_dict: dict):
+    """
+    Uploads the parser script and its config to the K8 pod over SSH, runs it there,
+    and removes the remote working directory afterwards.
+
+    Args:
+        config_dict (dict): Flat pipeline config; see send_and_run_script for required keys.
+    """
+    send_and_run_script(config_dict, "parser", remove_workdir=True)
+
+
+def prepare_parser_in_k8(config_dict: dict):
+    """
+    Opens the SSH/SFTP session send_and_run_parser_in_k8 needs ahead of time, so the
+    later launch skips the connection setup.
+
+    Args:
+        config_dict (dict): Flat pipeline config; see send_and_run_script for required keys.
+    """
+    prepare_script_launch(config_dict, "parser")
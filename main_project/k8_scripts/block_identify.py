@@ -1,9 +1,56 @@
 import os
+import mmap
+import logging
+
+log = logging.getLogger(__name__)
+
+def _find_marker_line(buf, marker, start):
+    """
+    Returns the offset of the first line at or after `start` (a line start)
+    whose first non-blank bytes are `marker`, or -1 if there is none.
+    """
+    pos = buf.find(marker, start)
+    while pos != -1:
+        line_start = buf.rfind(b"\n", 0, pos) + 1
+        # Only indentation may precede the marker on its line; this keeps
+        # commented-out markers from being picked up
+        if not buf[line_start:pos].strip():
+            return line_start
+        pos = buf.find(marker, pos + len(marker))
+    return -1
+
+
+def _slice_block(buf):
+    """
+    Returns (block_bytes, has_end) for the first UserGroup block in `buf`,
+    or (None, False) if there is no Begin marker.
+    """
+    begin = _find_marker_line(buf, b"Begin UserGroup", 0)
+    if begin == -1:
+        return None, False
+    # Report byte offsets: a line number would need a count over buf[:pos], which
+    # copies the whole mapped prefix
+    print(f"[INFO] >>> Found 'Begin UserGroup' at byte offset {begin}")
+
+    # Search for End after the Begin line itself
+    begin_line_end = buf.find(b"\n", begin)
+    end = -1 if begin_line_end == -1 else _find_marker_line(buf, b"End UserGroup", begin_line_end + 1)
+    if end == -1:
+        return buf[begin:], False
+
+    print(f"[INFO] >>> Found 'End UserGroup' at byte offset {end}")
+    end_line_end = buf.find(b"\n", end)
+    return (buf[begin:] if end_line_end == -1 else buf[begin:end_line_end]), True
+
 
 def extract_first_usergroup_block(file_path):
     """
     Extracts the first UserGroup block from the file as raw lines.
 
+    The file is memory-mapped and the block boundaries are located with a
+    byte-level find, so only the block itself is decoded, split and walked in
+    Python; the rest of the file is never turned into str objects.
+
     Parameters
     ----------
     file_path : str
@@ -14,42 +61,41 @@ def extract_first_usergroup_block(file_path):
     List[str]
         Raw lines from the first UserGroup block, including header and data.
     """
-    if not os.path.isfile(file_path):
-        print(f"[ERROR] File not found: {file_path}")
-        return []
-
     print(f"[INFO] Reading file: {file_path}")
 
-    inside_block = False
     collected_lines = []
 
     try:
-        with open(file_path, "r") as f:
-            for i, line in enumerate(f):
-                stripped_line = line.rstrip("\n")
-                print(f"[DEBUG] Line {i}: {stripped_line}")
-
-                if "Begin UserGroup" in stripped_line:
-                    inside_block = True
-                    print(f"[INFO] >>> Found 'Begin UserGroup' at line {i}")
-                    collected_lines.append(stripped_line)
-                    continue
+        with open(file_path, "rb") as f:
+            # mmap refuses zero-length files; those can't hold a block anyway
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    block, has_end = _slice_block(mm)
+            else:
+                block, has_end = None, False
 
-                if inside_block:
-                    collected_lines.append(stripped_line)
-                    print(f"[DEBUG] >>> Collected line: {stripped_line}")
+        if block is not None:
+            collected_lines = block.decode("utf-8", errors="replace").split("\n")
+            if not has_end and collected_lines[-1] == "":
+                # Trailing newline at EOF without an End marker
+                collected_lines.pop()
+            if b"\r" in block:
+                # Match text-mode reads of CRLF files
+                collected_lines = [line.rstrip("\r") for line in collected_lines]
 
-                    if "End UserGroup" in stripped_line:
-                        print(f"[INFO] >>> Found 'End UserGroup' at line {i}")
-                        break
+            if log.isEnabledFor(logging.DEBUG):
+                for i, line in enumerate(collected_lines):
+                    log.debug("Line %d: %s", i, line)
 
         if not collected_lines:
             print("[WARN] No UserGroup block found.")
         else:
-            print("\n[INFO] Completed collecting UserGroup block:")
-            for cl in collected_lines:
-                print(f"  {cl}")
+            print(f"[INFO] Collected {len(collected_lines)} lines from UserGroup block")
 
+    except FileNotFoundError:
+        # No separate isfile() pre-check: one open() instead of stat + open per farm
+        print(f"[ERROR] File not found: {file_path}")
+        return []
     except Exception as e:
         print(f"[ERROR] Failed to read or process file: {e}")
         return []
@@ -1,14 +1,21 @@
+import io
 import os
+import gzip
 import json
 
+# Compact separators; one shared encoder instead of a fresh one per record
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
 def write_records_to_ndjson_file(records, output_dir, index_name, ts_str):
     """
     Writes records as NDJSON content into a `.json` file using a consistent timestamp string.
 
     Parameters
     ----------
-    records : List[Dict]
-        Parsed records to write.
+    records : Iterable[Dict]
+        Parsed records to write. May be a generator; it is consumed once while
+        writing, so records never need to be held in memory all at once.
 
     output_dir : str
         Directory to save the .json file.
@@ -25,7 +32,9 @@ def write_records_to_ndjson_file(records, output_dir, index_name, ts_str):
     str or None
         Full path to the written file or None if writing failed.
     """
-    if not records:
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
         print("[INFO] No records to write. Skipping file generation.")
         return None
 
@@ -34,11 +43,47 @@ def write_records_to_ndjson_file(records, output_dir, index_name, ts_str):
 
     try:
         os.makedirs(output_dir, exist_ok=True)
-        with open(output_path, "w") as f:
+        # Encode and write one record at a time into the buffered binary file;
+        # the 1 MiB buffer keeps the number of write() syscalls small
+        record_count = 1
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            f.write(_ENCODER.encode(first).encode() + b"\n")
             for record in records:
-                f.write(json.dumps(record) + "\n")
-        print(f"[INFO] Wrote {len(records)} records to: {output_path}")
+                f.write(_ENCODER.encode(record).encode() + b"\n")
+                record_count += 1
+        print(f"[INFO] Wrote {record_count} records to: {output_path}")
         return output_path
     except Exception as e:
         print(f"[ERROR] Failed to write file: {e}")
         return None
+
+
+def gzip_ndjson_lines(ndjson_lines, compresslevel=3):
+    """
+    Streams already-encoded NDJSON lines through gzip into an in-memory payload.
+
+    Lines are compressed as they arrive, so only the compressed output is held,
+    never the raw lines or a joined copy of them.
+
+    Parameters
+    ----------
+    ndjson_lines : Iterable[bytes]
+        Newline-terminated JSON lines. May be a generator; it is consumed once.
+    compresslevel : int (default = 3)
+        gzip level; low levels keep nearly all of the ratio on repetitive NDJSON
+        for a fraction of the CPU.
+
+    Returns
+    -------
+    Tuple[bytes, int]
+        The gzip-compressed payload and the number of lines written.
+    """
+    buf = io.BytesIO()
+    line_count = 0
+    # The BufferedWriter batches the short lines so zlib sees 64 KiB writes
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=compresslevel) as gz, \
+            io.BufferedWriter(gz, buffer_size=1 << 16) as out:
+        for line in ndjson_lines:
+            out.write(line)
+            line_count += 1
+    return buf.getvalue(), line_count
@@ -1,13 +1,40 @@
+import json
+import argparse
+from k8_scripts.run_parser_job import parse_multiple_farms_and_upload_to_s3
+
+def load_job_config(config_path):
+    with open(config_path, "rb") as f:
+        return json.load(f)
+
+
 def k8_to_aws_s3_main(config_dict):
-  farm_list = config_dict["farm_list"]
-  file_path_template = config_dict["template_path"]
-  s3_bucket = config_dict["s3_bucket_name"]
-  index_name = config_dict["index_name"]
-  s3_key_prefix = config_dict["s3_key"]
-  aws_access_key = config_dict["aws_access_key"]
-  aws_secret_key = config_dict["aws_secret_key"]
-  timezone = config_dict["es_timezone"]
-  temp_output_dir = config_dict["temp_output_dir"]
-  
+    # Bind every config field once, before any per-farm work starts
+    farm_list = config_dict["farm_list"]
+    file_path_template = config_dict["template_path"]
+    s3_bucket = config_dict["s3_bucket_name"]
+    index_name = config_dict["index_name"]
+    s3_key_prefix = config_dict["s3_key"]
+    aws_access_key = config_dict["aws_access_key"]
+    aws_secret_key = config_dict["aws_secret_key"]
+    timezone = config_dict["es_timezone"]
+    s3_region = config_dict.get("s3_region")
+
+    return parse_multiple_farms_and_upload_to_s3(
+        farm_list=farm_list,
+        file_path_template=file_path_template,
+        s3_bucket=s3_bucket,
+        s3_key_prefix=s3_key_prefix,
+        index_name=index_name,
+        aws_access_key=aws_access_key,
+        aws_secret_key=aws_secret_key,
+        timezone=timezone,
+        s3_region=s3_region
+    )
+
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse LSF UserGroup blocks and upload them to S3 as NDJSON")
+    parser.add_argument("--config", required=True, help="Path to the JSON job config")
+    args = parser.parse_args()
 
+    k8_to_aws_s3_main(load_job_config(args.config))
@@ -1,86 +1,245 @@
 import re
+import json
+import logging
 
-def parse_usergroup_block_lines(collected_lines, farm_name):
+log = logging.getLogger(__name__)
+
+# GROUP_NAME (members...) ([user, value] [user, value]...) -- members and shares may contain
+# spaces; the parentheses around the share list are optional
+_LINE = re.compile(r"(\S+)\s+\(([^)]*)\)\s+\(?((?:\[[^\]]*\]\s*)+)\)?")
+_HEADER_FIELDS = frozenset({"GROUP_NAME", "GROUP_MEMBER", "USER_SHARES"})
+# Same settings as the NDJSON writer's encoder, so hand-assembled lines match it byte for byte
+_ENCODE = json.JSONEncoder(separators=(",", ":")).encode
+
+def _parse_shares(shares_raw):
     """
-    Parses raw lines from a UserGroup block and extracts user fairshare records.
+    Turns "[alice, 10][bob, 20]" into {"alice": 10, "bob": 20} with plain string
+    operations; entries that aren't "[user, integer]" are skipped.
+    """
+    share_dict = {}
+    for item in shares_raw.split("]"):
+        item = item.strip()
+        if item[:1] != "[":
+            continue
+        user, _, value = item[1:].partition(",")
+        user = user.strip()
+        value = value.strip()
+        digits = value[1:] if value[:1] == "-" else value
+        if user and digits.isdecimal():
+            share_dict[user] = int(value)
+    return share_dict
+
+
+def iter_usergroup_entries(collected_lines, farm_name):
+    """
+    Walks the raw lines of a UserGroup block and yields one entry per group data line.
+
+    This is the single state machine shared by the record counter and the parser,
+    so both see exactly the same groups and members.
 
     Parameters
     ----------
-    collected_lines : List[str]
+    collected_lines : Iterable[str]
         Raw lines from a single UserGroup block (including header and data).
     farm_name : str
-        Name of the farm this data belongs to.
+        Name of the farm this data belongs to (used in log messages).
 
-    Returns
-    -------
-    List[Dict]
-        Parsed user-level records from the block. Each record is a dict:
-        {
-            "farm": <farm_name>,
-            "group": <group_name>,
-            "user_name": <user>,
-            "fairshare": <int>
-        }
+    Yields
+    ------
+    Tuple[str, List[str], Dict[str, int]]
+        (group_name, members, share_dict) for each well-formed data line.
     """
-    parsed_records = []
     in_group_block = False
     process_data_lines = False
 
     for i, line in enumerate(collected_lines):
-        line = line.strip()
-        print(f"[DEBUG][{farm_name}] Line {i}: {line}")
+        # Only leading blanks matter for the prefix tests below (split() ignores the
+        # trailing ones), and lstrip() returns the line itself when it has none
+        line = line.lstrip()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[%s] Line %d: %s", farm_name, i, line)
+
+        # Most lines are data lines, so test the data state first and only
+        # look for block markers / the header while outside the data section
+        if not process_data_lines:
+            if not in_group_block:
+                if line.startswith("Begin UserGroup"):
+                    in_group_block = True
+                    print(f"[INFO][{farm_name}] >>> Start of UserGroup block")
+                continue
+
+            if line.startswith("End UserGroup"):
+                print(f"[INFO][{farm_name}] >>> End of UserGroup block")
+                break
+
+            # The header always leads with GROUP_NAME; the prefix test rejects other lines
+            # cheaply, and the column names are then checked as whole tokens in one subset test
+            if line.startswith("GROUP_NAME") and _HEADER_FIELDS <= set(line.partition("#")[0].split()):
+                process_data_lines = True
+                print(f"[INFO][{farm_name}] >>> Detected header line")
+            continue
 
-        if "Begin UserGroup" in line:
-            in_group_block = True
-            print(f"[INFO][{farm_name}] >>> Start of UserGroup block")
+        # Dispatch on the first character: blank and comment lines are dropped with
+        # one compare, and only lines starting with "E" pay for the End marker test
+        head = line[:1]
+        if not head or head == "#":
             continue
 
-        if "End UserGroup" in line:
+        if head == "E" and line.startswith("End UserGroup"):
             print(f"[INFO][{farm_name}] >>> End of UserGroup block")
             break
 
-        if in_group_block and "GROUP_NAME" in line and "GROUP_MEMBER" in line and "USER_SHARES" in line:
-            process_data_lines = True
-            print(f"[INFO][{farm_name}] >>> Detected header line")
-            continue
-
-        if process_data_lines:
-            # Remove any trailing comments
-            cleaned = line.split("#")[0].strip()
-            parts = re.split(r"\s+", cleaned)
+        # Data line: drop any trailing comment, then pick out the three fields with
+        # one anchored match so "(alice bob)" and "[alice, 10]" stay in one piece
+        data = line.partition("#")[0]
+        m = _LINE.match(data)
+        if m is not None:
+            group_name, members_raw, shares_raw = m.groups()
+        else:
+            # Not in the parenthesised/bracketed form; fall back to whitespace fields
+            parts = data.split()
             if len(parts) < 3:
-                print(f"[WARN][{farm_name}] Skipping malformed line: {line}")
+                print(f"[WARN][{farm_name}] Skipping malformed line: {line.rstrip()}")
                 continue
+            group_name, members_raw, shares_raw = parts[0], parts[1], parts[2]
 
-            group_name = parts[0]
-            members_raw = parts[1]
-            shares_raw = parts[2]
-
-            members = re.findall(r'\w+', members_raw)
-            shares = re.findall(r'\[([^\]]+)\]', shares_raw)
-            share_dict = {}
-
-            for s in shares:
-                try:
-                    user, val = s.split(",")
-                    share_dict[user.strip()] = int(val.strip())
-                except Exception as e:
-                    print(f"[WARN][{farm_name}] Skipping malformed share '{s}': {e}")
-                    continue
-
-            for user in members:
-                fairshare = share_dict.get(user)
-                if fairshare is not None:
-                    record = {
-                        "farm": farm_name,
-                        "group": group_name,
-                        "user_name": user,
-                        "fairshare": fairshare
-                    }
-                    parsed_records.append(record)
-                    print(f"[DEBUG][{farm_name}] Parsed record: {record}")
-                else:
-                    print(f"[WARN][{farm_name}] Fairshare not found for user: {user}")
-
-    print(f"[INFO][{farm_name}] Total parsed records: {len(parsed_records)}")
-    return parsed_records
+        # Members are blank- or comma-separated; names keep any '-', '.' or '/' they carry
+        # (the fallback path may still carry the surrounding parentheses)
+        members = members_raw.strip("()").replace(",", " ").split()
+        share_dict = _parse_shares(shares_raw)
+
+        yield group_name, members, share_dict
+
+
+def _iter_user_shares(collected_lines, farm_name):
+    # (group_name, user, fairshare) per member that has a share; shared by the
+    # dict and NDJSON producers so both log and count identically
+    record_count = 0
+    missing_count = 0
+
+    for group_name, members, share_dict in iter_usergroup_entries(collected_lines, farm_name):
+        # Groups on a [default, N] share have no member entries at all; one C-level
+        # disjointness test settles those without a Python-level lookup per member
+        if share_dict.keys().isdisjoint(members):
+            missing_count += len(members)
+            if log.isEnabledFor(logging.DEBUG):
+                for user in members:
+                    log.debug("[%s] Fairshare not found for user: %s (group %s)", farm_name, user, group_name)
+            continue
+
+        for user in members:
+            fairshare = share_dict.get(user)
+            if fairshare is not None:
+                record_count += 1
+                yield group_name, user, fairshare
+            else:
+                # Groups on a [default, N] share miss every member; report per user
+                # only at DEBUG and summarise once per farm below
+                missing_count += 1
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("[%s] Fairshare not found for user: %s (group %s)", farm_name, user, group_name)
+
+    if missing_count:
+        print(f"[WARN][{farm_name}] Fairshare not found for {missing_count} user(s); enable DEBUG logging for names")
+    print(f"[INFO][{farm_name}] Total parsed records: {record_count}")
+
+
+def iter_usergroup_records(collected_lines, farm_name, timestamp=None):
+    """
+    Lazily yields user fairshare records from raw UserGroup block lines.
+
+    Records are produced one at a time so a consumer never has to hold the
+    whole run in memory.
+
+    Parameters
+    ----------
+    collected_lines : Iterable[str]
+        Raw lines from a single UserGroup block (including header and data).
+    farm_name : str
+        Name of the farm this data belongs to.
+    timestamp : str, optional
+        Run timestamp (already formatted) stamped on every record. Omitted from records if None.
+
+    Yields
+    ------
+    Dict
+        One record per user, shaped as described in parse_usergroup_block_lines.
+    """
+    extra = {"timestamp": timestamp} if timestamp is not None else {}
+
+    for group_name, user, fairshare in _iter_user_shares(collected_lines, farm_name):
+        yield {
+            "farm": farm_name,
+            "group": group_name,
+            "user_name": user,
+            "fairshare": fairshare,
+            **extra
+        }
+
+
+def iter_usergroup_ndjson_lines(collected_lines, farm_name, timestamp=None):
+    """
+    Lazily yields the NDJSON encoding of each user fairshare record, without building the dicts.
+
+    The schema is fixed, so each group's line is pre-rendered once as a bytes
+    template and only the user name and share are formatted into it per record.
+    Each line is byte-identical to encoding the matching iter_usergroup_records
+    dict with the compact NDJSON encoder.
+
+    Parameters
+    ----------
+    collected_lines : Iterable[str]
+        Raw lines from a single UserGroup block (including header and data).
+    farm_name : str
+        Name of the farm this data belongs to.
+    timestamp : str, optional
+        Run timestamp (already formatted) stamped on every record. Omitted from records if None.
+
+    Yields
+    ------
+    bytes
+        One newline-terminated JSON object per user.
+    """
+    # Literal '%' in the encoded names is doubled so only the two slots are formatted
+    farm_prefix = ('{"farm":' + _ENCODE(farm_name) + ',"group":').replace("%", "%%")
+    suffix = (',"timestamp":' + _ENCODE(timestamp) + "}\n" if timestamp is not None else "}\n").replace("%", "%%")
+
+    last_group = None
+    line_template = None
+    for group_name, user, fairshare in _iter_user_shares(collected_lines, farm_name):
+        if group_name != last_group:
+            last_group = group_name
+            line_template = (
+                farm_prefix + _ENCODE(group_name).replace("%", "%%")
+                + ',"user_name":%s,"fairshare":%d' + suffix
+            ).encode()
+        yield line_template % (_ENCODE(user).encode(), fairshare)
+
+
+def parse_usergroup_block_lines(collected_lines, farm_name, timestamp=None):
+    """
+    Parses raw lines from a UserGroup block and extracts user fairshare records.
+
+    Parameters
+    ----------
+    collected_lines : List[str]
+        Raw lines from a single UserGroup block (including header and data).
+    farm_name : str
+        Name of the farm this data belongs to.
+    timestamp : str, optional
+        Run timestamp (already formatted) stamped on every record. Computed once by
+        the caller so all records of a run share it. Omitted from records if None.
+
+    Returns
+    -------
+    List[Dict]
+        Parsed user-level records from the block. Each record is a dict:
+        {
+            "farm": <farm_name>,
+            "group": <group_name>,
+            "user_name": <user>,
+            "fairshare": <int>,
+            "timestamp": <timestamp>    # only if given
+        }
+    """
+    return list(iter_usergroup_records(collected_lines, farm_name, timestamp))
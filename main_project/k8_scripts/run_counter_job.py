@@ -1,9 +1,26 @@
 import os
-import re
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
 from k8_scripts.block_identify import extract_first_usergroup_block  # Update this import path if needed
+from k8_scripts.parsing_funcs import iter_usergroup_entries
 
-def estimate_total_json_records(farm_list, file_path_template):
+def _count_farm_records(farm: str, template_parts: List[str]) -> int:
+    file_path = farm.join(template_parts)
+    print(f"\n[INFO][{farm}] Checking file: {file_path}")
+
+    lines = extract_first_usergroup_block(file_path)
+    if not lines:
+        print(f"[INFO][{farm}] Skipping — no valid UserGroup block found.")
+        return 0
+
+    # Same state machine as the parser, so the estimate counts exactly the members it will see
+    record_count = sum(len(members) for _, members, _ in iter_usergroup_entries(lines, farm))
+
+    print(f"[INFO][{farm}] Estimated JSON records: {record_count}")
+    return record_count
+
+
+def estimate_total_json_records(farm_list: List[str], file_path_template: str) -> int:
     """
     estimate_total_json_records
 
@@ -59,47 +76,16 @@ def estimate_total_json_records(farm_list, file_path_template):
 
     ----------------------------------------------------------------------------------------
     """
+    if not farm_list:
+        print("\n[SUMMARY] No farms to evaluate. Total estimated JSON records: 0")
+        return 0
 
+    # Split the template once; each farm path is then a single join
+    template_parts = file_path_template.split("{farm}")
 
-
-
-    total_records = 0
-    # ts = pendulum.now(timezone).to_iso8601_string()
-
-    for farm in farm_list:
-        file_path = file_path_template.replace("{farm}", farm)
-        print(f"\n[INFO][{farm}] Checking file: {file_path}")
-
-        lines = extract_first_usergroup_block(file_path)
-        if not lines:
-            print(f"[INFO][{farm}] Skipping — no valid UserGroup block found.")
-            continue
-
-        record_count = 0
-        header_found = False
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            if "GROUP_NAME" in line and "GROUP_MEMBER" in line and "USER_SHARES" in line:
-                header_found = True
-                continue
-
-            if not header_found:
-                continue
-
-            parts = re.split(r"\s+", line.split("#")[0].strip())
-            if len(parts) < 3:
-                continue
-
-            member_raw = parts[1]
-            members = re.findall(r"\w+", member_raw)
-            record_count += len(members)
-
-        print(f"[INFO][{farm}] Estimated JSON records: {record_count}")
-        total_records += record_count
+    # Farm files are independent; overlap their (often NFS) reads across threads
+    with ThreadPoolExecutor(max_workers=min(16, len(farm_list))) as executor:
+        total_records = sum(executor.map(lambda farm: _count_farm_records(farm, template_parts), farm_list))
 
     print(f"\n[SUMMARY] Total estimated JSON records across all farms: {total_records}")
     return total_records
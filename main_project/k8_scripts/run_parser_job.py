@@ -1,14 +1,11 @@
-import os
-import re
-import json
-import pendulum
-import boto3
-from typing import List, Tuple, Optional
-from k8_scipts.block_identify import extract_first_usergroup_block_lines
-from k8_scripts.parsing_func import parse_usergroup_block_lines
-from k8_scripts.creating_temp_json_file import write_records_to_json
-from k8_scripts.upload_to_s3_func import upload_json_to_s3
-from k8_scripts.cleaning_k8_files import clean_temp_json_file
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from k8_scripts.block_identify import extract_first_usergroup_block
+from k8_scripts.parsing_funcs import iter_usergroup_ndjson_lines
+from k8_scripts.creating_temp_json_file import gzip_ndjson_lines
+from k8_scripts.upload_to_s3_func import upload_json_bytes_to_s3
 
 def parse_multiple_farms_and_upload_to_s3(
     farm_list: List[str],
@@ -19,13 +16,13 @@ def parse_multiple_farms_and_upload_to_s3(
     aws_access_key: str,
     aws_secret_key: str,
     timezone: str = "UTC",
-    temp_output_dir: str = "/tmp"
-) -> Optional[Tuple[str, str]]:
+    s3_region: Optional[str] = None
+) -> Optional[str]:
     """
     parse_multiple_farms_and_upload_to_s3
 
     Parses LSF-style user group configuration files from multiple farms, extracts fairshare user records, 
-    and writes the data to a single NDJSON file which is uploaded to AWS S3.
+    and uploads the data to AWS S3 as a single NDJSON file, built in memory (no local temp file).
 
     ----------------------------------------------------------------------------------------
 
@@ -57,8 +54,8 @@ def parse_multiple_farms_and_upload_to_s3(
     - timezone : str (default = "UTC")
         Timezone for timestamping records and S3 key naming.
 
-    - temp_output_dir : str (default = "/tmp")
-        Local directory path to write the temporary NDJSON file before upload.
+    - s3_region : str, optional
+        AWS region of the bucket. Lets the S3 client talk to the right regional endpoint directly.
 
     ----------------------------------------------------------------------------------------
 
@@ -96,8 +93,7 @@ def parse_multiple_farms_and_upload_to_s3(
 
     Output (NDJSON File)
     --------------------
-    - Written to: /tmp/lsf_user_share_2025-06-12T18-45-00.ndjson (local)
-    - Uploaded to: s3://<bucket>/<s3_key_prefix>/<YYYY-MM-DD>/<HH-mm>/<index_name>_<timestamp>.ndjson
+    - Uploaded (gzipped) to: s3://<bucket>/<s3_key_prefix>/<YYYY-MM-DD>/<HH-mm>/<index_name>_<timestamp>.json.gz
 
     Each line:
         {"farm": "us01_swe", "group": "prod_users", "user_name": "alice", "fairshare": 10, "timestamp": "..."}
@@ -114,7 +110,7 @@ def parse_multiple_farms_and_upload_to_s3(
 
     Returns
     -------
-    - Tuple: (local_output_path, s3_uri) on success
+    - str: s3_uri on success
     - None if no records are parsed or upload fails
 
     ----------------------------------------------------------------------------------------
@@ -132,35 +128,43 @@ def parse_multiple_farms_and_upload_to_s3(
     )
     """
 
-    ts_obj = pendulum.now(timezone)
-    timestamp_str = ts_obj.to_iso8601_string()
-    all_records = []
+    # Stdlib clock instead of pendulum: one fewer dependency on the pod, and the
+    # string is built once per run
+    ts_obj = datetime.now(dt_timezone.utc if timezone == "UTC" else ZoneInfo(timezone))
+    timestamp_str = ts_obj.isoformat()
+    if timezone == "UTC":
+        # Same "Z" suffix pendulum's to_iso8601_string() used for UTC
+        timestamp_str = timestamp_str[:-6] + "Z"
+    template_parts = file_path_template.split("{farm}")  # split once; each farm path is a single join
 
-    for farm in farm_list:
-        file_path = file_path_template.replace("{farm}", farm)
-        if not os.path.isfile(file_path):
-            print(f"[WARN] File not found for {farm}: {file_path}")
-            continue
-
-        with open(file_path, "r") as f:
-            raw_lines = [line.strip() for line in f if line.strip()]
-
-        block_lines = extract_first_usergroup_block_lines(raw_lines)
-        parsed = parse_usergroup_block_lines(block_lines, farm, timestamp_str)
-        print(f"[INFO][{farm}] Parsed {len(parsed)} records")
-        all_records.extend(parsed)
-
-    if not all_records:
+    if not farm_list:
         print("[INFO] No records found. Skipping JSON and upload.")
         return
 
-    output_path = write_records_to_json(all_records, index_name, output_dir, ts_obj)
-    if not output_path:
+    # Farm files are independent; overlap their (often NFS) reads across threads.
+    # map() keeps farm order, so the NDJSON output order is unchanged. No isfile()
+    # pre-check: the extractor opens each file once and reports a missing one itself.
+    with ThreadPoolExecutor(max_workers=min(16, len(farm_list))) as executor:
+        farm_blocks = executor.map(
+            lambda farm: (farm, extract_first_usergroup_block(farm.join(template_parts))),
+            farm_list
+        )
+
+        # Records go straight from the parser to NDJSON bytes and on into gzip as
+        # they are produced; no per-record dict is built and only the compressed
+        # payload is held, so memory tracks the upload size rather than the record count
+        body, record_count = gzip_ndjson_lines(
+            ndjson_line
+            for farm, block_lines in farm_blocks
+            for ndjson_line in iter_usergroup_ndjson_lines(block_lines, farm, timestamp_str)
+        )
+
+    if not record_count:
+        print("[INFO] No records found. Skipping upload.")
         return
 
-    s3_uri = upload_json_to_s3(output_path, s3_bucket, s3_key_prefix,
-                               index_name, ts_obj, aws_access_key, aws_secret_key)
-    # if s3_uri:
-    #     clean_temp_json_file(output_path)
-
-    return output_path, s3_uri
+    # Upload straight from memory: no temp file to write, re-read and clean up
+    print(f"[INFO] Encoded {record_count} records for upload")
+    return upload_json_bytes_to_s3(body, s3_bucket, s3_key_prefix, index_name,
+                                   ts_obj, aws_access_key, aws_secret_key, gzipped=True,
+                                   region_name=s3_region)
@@ -1,6 +1,48 @@
+import io
 import os
+from functools import lru_cache
 import boto3
-import pendulum
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# Payloads under this size go up in a single PutObject request
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+# Files above the threshold are sent as parallel multipart uploads; large parts
+# keep per-request overhead low and 16 concurrent parts fill high-RTT links
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_THRESHOLD,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True
+)
+
+# Pool sized above the transfer concurrency so multipart threads never wait for a
+# connection; adaptive retries back off on S3 throttling instead of failing the run
+_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={"max_attempts": 5, "mode": "adaptive"}
+)
+
+@lru_cache(maxsize=8)
+def _get_s3_client(aws_access_key, aws_secret_key, region_name=None):
+    # Client construction loads botocore service models; build it once per credential
+    # pair and region. Naming the bucket's region up front saves the redirect round
+    # trip S3 answers with when a request goes to the wrong regional endpoint.
+    return boto3.client(
+        "s3",
+        aws_access_key_id=aws_access_key,
+        aws_secret_access_key=aws_secret_key,
+        region_name=region_name,
+        config=_CLIENT_CONFIG
+    )
+
+def _build_s3_key(s3_key_prefix, index_name, ts_obj, extension=".json"):
+    ts_str = ts_obj.strftime("%Y-%m-%dT%H-%M-%S")
+    s3_date = ts_obj.strftime("%Y-%m-%d")
+    s3_time = "00-00"
+    filename = f"{index_name}_{ts_str}{extension}"
+    return f"{s3_key_prefix}/{s3_date}/{s3_time}/{filename}"
 
 def upload_json_file_to_s3(
     local_file_path,
@@ -9,7 +51,8 @@ def upload_json_file_to_s3(
     index_name,
     ts_obj,
     aws_access_key,
-    aws_secret_key
+    aws_secret_key,
+    region_name=None
 ):
     """
     Uploads a single .json file to AWS S3 under a structured key path with fixed time component as '00-00'.
@@ -28,8 +71,9 @@ def upload_json_file_to_s3(
     index_name : str
         Logical identifier used in the S3 filename.
 
-    ts_obj : pendulum.DateTime
-        Timestamp object used to structure the S3 key path and file name.
+    ts_obj : datetime.datetime
+        Timestamp object used to structure the S3 key path and file name
+        (pendulum.DateTime works too, as a datetime subclass).
 
     aws_access_key : str
         AWS access key ID.
@@ -37,29 +81,109 @@ def upload_json_file_to_s3(
     aws_secret_key : str
         AWS secret access key.
 
+    region_name : str, optional
+        AWS region of the bucket; None lets boto3 resolve it from the environment.
+
     Returns
     -------
     str or None
         Full S3 URI if upload was successful, else None.
     """
-    if not os.path.exists(local_file_path):
+    s3_key = _build_s3_key(s3_key_prefix, index_name, ts_obj)
+
+    try:
+        s3 = _get_s3_client(aws_access_key, aws_secret_key, region_name)
+        # No exists() pre-check: getsize raises FileNotFoundError for a missing file
+        size = os.path.getsize(local_file_path)
+        if size < _MULTIPART_THRESHOLD:
+            # One PutObject request; skips the transfer manager's thread and future setup
+            with open(local_file_path, "rb") as f:
+                s3.put_object(
+                    Bucket=s3_bucket,
+                    Key=s3_key,
+                    Body=f,
+                    ContentLength=size,
+                    ContentType="application/x-ndjson"
+                )
+        else:
+            s3.upload_file(local_file_path, s3_bucket, s3_key, Config=_TRANSFER_CONFIG)
+        print(f"[INFO] Uploaded to s3://{s3_bucket}/{s3_key}")
+        return f"s3://{s3_bucket}/{s3_key}"
+    except FileNotFoundError:
         print(f"[ERROR] File does not exist: {local_file_path}")
         return None
+    except Exception as e:
+        print(f"[ERROR] Upload failed: {e}")
+        return None
 
-    ts_str = ts_obj.format("YYYY-MM-DDTHH-mm-ss")
-    s3_date = ts_obj.format("YYYY-MM-DD")
-    s3_time = "00-00"  
-    filename = f"{index_name}_{ts_str}.json"
-    s3_key = f"{s3_key_prefix}/{s3_date}/{s3_time}/{filename}"
+def upload_json_bytes_to_s3(
+    body,
+    s3_bucket,
+    s3_key_prefix,
+    index_name,
+    ts_obj,
+    aws_access_key,
+    aws_secret_key,
+    gzipped=False,
+    region_name=None
+):
+    """
+    Uploads an in-memory .json payload to AWS S3 under the same key layout as upload_json_file_to_s3.
+
+    A gzip-compressed payload is stored as `.json.gz`; Snowflake detects the
+    compression on load (COMPRESSION = AUTO).
+
+    Parameters
+    ----------
+    body : bytes
+        File content to upload (e.g. NDJSON).
+
+    s3_bucket : str
+        Name of the S3 bucket.
+
+    s3_key_prefix : str
+        Prefix path inside the bucket (e.g., "fairshare/all_farms").
+
+    index_name : str
+        Logical identifier used in the S3 filename.
+
+    ts_obj : datetime.datetime
+        Timestamp object used to structure the S3 key path and file name
+        (pendulum.DateTime works too, as a datetime subclass).
+
+    aws_access_key : str
+        AWS access key ID.
+
+    aws_secret_key : str
+        AWS secret access key.
+
+    gzipped : bool (default = False)
+        True if `body` is already gzip-compressed; it is then uploaded as `.json.gz`.
+
+    region_name : str, optional
+        AWS region of the bucket; None lets boto3 resolve it from the environment.
+
+    Returns
+    -------
+    str or None
+        Full S3 URI if upload was successful, else None.
+    """
+    s3_key = _build_s3_key(s3_key_prefix, index_name, ts_obj, ".json.gz" if gzipped else ".json")
 
     try:
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key
-        )
-        s3.upload_file(local_file_path, s3_bucket, s3_key)
-        print(f"[INFO] Uploaded to s3://{s3_bucket}/{s3_key}")
+        s3 = _get_s3_client(aws_access_key, aws_secret_key, region_name)
+        if len(body) < _MULTIPART_THRESHOLD:
+            # One PutObject request; skips the transfer manager's thread and future setup
+            s3.put_object(
+                Bucket=s3_bucket,
+                Key=s3_key,
+                Body=body,
+                ContentType="application/gzip" if gzipped else "application/x-ndjson"
+            )
+        else:
+            # upload_fileobj applies the same multipart settings as file uploads
+            s3.upload_fileobj(io.BytesIO(body), s3_bucket, s3_key, Config=_TRANSFER_CONFIG)
+        print(f"[INFO] Uploaded {len(body)} bytes to s3://{s3_bucket}/{s3_key}")
         return f"s3://{s3_bucket}/{s3_key}"
     except Exception as e:
         print(f"[ERROR] Upload failed: {e}")
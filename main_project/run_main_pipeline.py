@@ -1,11 +1,12 @@
 # Updated main pipeline logic with retry mechanism
 
 import time
+from datetime import datetime, timezone
 from main_project.snowflake_ops.compute_scaled_pause import compute_scaled_pause
 from main_project.snowflake_ops.update_audit_retry_attempt import update_retry_attempt_in_audit_table
-from main_project.utils.check_snowflake_audit import check_audit_status
+from main_project.utils.check_audit_status import check_audit_status
 from main_project.k8_launcher.send_and_run_count_in_k8 import send_and_run_count_in_k8
-from main_project.k8_launcher.send_and_run_parser_in_k8 import send_and_run_parser_in_k8
+from main_project.k8_launcher.send_and_run_parser_in_k8 import send_and_run_parser_in_k8, prepare_parser_in_k8
 from main_project.snowflake_ops.get_es_count_from_audit import get_es_count_from_audit_table
 from main_project.snowflake_ops.trigger_task_and_wait import trigger_snowflake_task_and_wait
 from main_project.snowflake_ops.get_sf_count import get_sf_count_from_snowflake
@@ -13,39 +14,45 @@ from main_project.snowflake_ops.compare_and_cleanup import handle_data_compariso
 from main_project.utils.get_query_timestamps import get_query_window_timestamps
 from main_project.snowflake_ops.insert_audit_entry import insert_initial_audit_entry
 
+# Audit statuses that mean this window is already handled (or being handled)
+_STATUS_SKIP = frozenset({"in_progress", "completed"})
+
+def _parse_window_ts(ts: str) -> datetime:
+    # fromisoformat only accepts a trailing "Z" from Python 3.11 on
+    return datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+
 def run_main_pipeline(config_dict):
     # Step 1: Get query timestamps
     start_ts, end_ts = get_query_window_timestamps(config_dict["timezone"])
     config_dict["query_windows_start_ts"] = start_ts
     config_dict["query_windows_end_ts"] = end_ts
 
-    status = check_audit_status({
-        "pipeline_name": config_dict["pipeline_name"],
-        "index_name": config_dict["index_name"],
-        "query_windows_start_ts": start_ts,
-        "query_windows_end_ts": end_ts,
-        **config_dict
-    })
+    # The window bounds were just stored in config_dict, so it already carries every
+    # key the check reads; pass it by reference instead of copying it into a new dict
+    status = check_audit_status(config_dict)
 
     now = time.time()
 
     # Step 2: Skip if status is in_progress or completed
-    if status in ["in_progress", "completed"]:
+    if status in _STATUS_SKIP:
         print("[INFO] Skipping ELT - already processed or running.")
         return
 
     # Step 3: Re-run if failed and within valid window
     if status == "failed":
-        ts_now = time.time()
-        ts_start = time.mktime(time.strptime(start_ts, "%Y-%m-%dT%H:%M:%S%z"))
-        ts_end = time.mktime(time.strptime(end_ts, "%Y-%m-%dT%H:%M:%S%z"))
-        if not (ts_start <= ts_now <= ts_end):
+        # The window bounds carry their offset ("Z" or +HH:MM, optional fractional
+        # seconds); aware datetimes compare by instant whatever offset each side
+        # carries, unlike strptime + mktime, which takes the wall time as local time
+        now_dt = datetime.now(timezone.utc)
+        if not (_parse_window_ts(start_ts) <= now_dt <= _parse_window_ts(end_ts)):
             print("[INFO] Skipping retry - outside retry window.")
             return
 
     # Step 4: Proceed with ELT + Audit Retry Loop
     max_retry_attempts = config_dict.get("max_retry_attempts", 3)
     retry_pause_base_secs = config_dict.get("retry_pause_base_secs", 30)
+    avg_base_record_count = config_dict.get("avg_base_record_count", 1000)
+    retry_pause_slope = config_dict.get("retry_pause_slope", 1.0)
     current_attempt = 1
 
     while current_attempt <= max_retry_attempts:
@@ -66,11 +73,18 @@ def run_main_pipeline(config_dict):
             scaled_ingest_wait = compute_scaled_pause(
                 record_count=es_count,
                 base_wait_secs=config_dict["base_sf_ingest_wait_secs"],
-                scaling_threshold=config_dict["avg_base_record_count"],
+                scaling_threshold=avg_base_record_count,
                 slope=config_dict["ingest_pause_slope"]
             )
             print(f"[INFO] Waiting {scaled_ingest_wait}s for Snowflake ingestion readiness")
-            time.sleep(scaled_ingest_wait)
+            # Use the idle wait to get the parser launch ready; only the remainder is slept
+            wait_started = time.monotonic()
+            try:
+                prepare_parser_in_k8(config_dict)
+            except Exception as prep_error:
+                # Best effort: the launch itself redoes anything that failed here
+                print(f"[WARN] Parser launch preparation failed: {prep_error}")
+            time.sleep(max(0.0, scaled_ingest_wait - (time.monotonic() - wait_started)))
 
             # Trigger ingestion
             trigger_snowflake_task_and_wait(config_dict)
@@ -100,10 +114,10 @@ def run_main_pipeline(config_dict):
 
             # Pause before next retry
             pause_time = compute_scaled_pause(
-                record_count=es_count if 'es_count' in locals() else config_dict.get("avg_base_record_count", 1000),
+                record_count=es_count if 'es_count' in locals() else avg_base_record_count,
                 base_wait_secs=retry_pause_base_secs,
-                scaling_threshold=config_dict.get("avg_base_record_count", 1000),
-                slope=config_dict.get("retry_pause_slope", 1.0)
+                scaling_threshold=avg_base_record_count,
+                slope=retry_pause_slope
             )
             print(f"[INFO] Waiting {pause_time}s before retrying...")
             time.sleep(pause_time)
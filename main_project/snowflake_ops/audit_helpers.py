@@ -1,4 +1,25 @@
-import snowflake.connector
+from functools import lru_cache
+
+from main_project.utils.snowflake_connect import get_shared_snowflake_connection
+
+# Cached per table; this only saves re-formatting the SQL string locally
+@lru_cache(maxsize=8)
+def _retry_update_sql(database: str, schema: str, table: str) -> str:
+    return f"""
+            UPDATE {database}.{schema}.{table}
+            SET retry_attempt = %(attempt)s
+            WHERE pipeline_name = %(pipeline_name)s
+              AND index_name = %(index_name)s
+              AND query_windows_start_ts = %(start_ts)s
+              AND query_windows_end_ts = %(end_ts)s
+        """
+
+@lru_cache(maxsize=8)
+def _prefix_count_sql(database: str, schema: str, table: str) -> str:
+    return f"""
+            SELECT COUNT(*) FROM {database}.{schema}.{table}
+            WHERE filename LIKE %(pattern)s
+        """
 
 def update_retry_attempt_in_audit_table(config_dict: dict, attempt_number: int):
     """
@@ -8,27 +29,11 @@ def update_retry_attempt_in_audit_table(config_dict: dict, attempt_number: int):
         config_dict (dict): Dictionary with Snowflake connection info and audit identifiers.
         attempt_number (int): Retry attempt number to update.
     """
-    table_fqn = f'{config_dict["sf_database"]}.{config_dict["sf_schema"]}.{config_dict["sf_audit_table"]}'
-
     try:
-        conn = snowflake.connector.connect(
-            user=config_dict["sf_user"],
-            password=config_dict["sf_password"],
-            account=config_dict["sf_account"],
-            warehouse=config_dict["sf_warehouse"],
-            database=config_dict["sf_database"],
-            schema=config_dict["sf_schema"]
-        )
+        conn = get_shared_snowflake_connection(config_dict)
         cursor = conn.cursor()
 
-        update_sql = f"""
-            UPDATE {table_fqn}
-            SET retry_attempt = %(attempt)s
-            WHERE pipeline_name = %(pipeline_name)s
-              AND index_name = %(index_name)s
-              AND query_windows_start_ts = %(start_ts)s
-              AND query_windows_end_ts = %(end_ts)s
-        """
+        update_sql = _retry_update_sql(config_dict["sf_database"], config_dict["sf_schema"], config_dict["sf_audit_table"])
         cursor.execute(update_sql, {
             "attempt": attempt_number,
             "pipeline_name": config_dict["pipeline_name"],
@@ -36,14 +41,12 @@ def update_retry_attempt_in_audit_table(config_dict: dict, attempt_number: int):
             "start_ts": config_dict["query_windows_start_ts"],
             "end_ts": config_dict["query_windows_end_ts"]
         })
-        conn.commit()
         print(f"[INFO] Updated retry_attempt to {attempt_number} in audit table.")
     except Exception as e:
         print(f"[ERROR] Failed to update retry attempt in audit table: {e}")
     finally:
         try:
             cursor.close()
-            conn.close()
         except:
             pass
 
@@ -62,21 +65,10 @@ def get_sf_count_from_snowflake(config_dict: dict, sf_col_pattern: str) -> int:
         int: Row count in the raw table matching the prefix.
     """
     try:
-        conn = snowflake.connector.connect(
-            user=config_dict["sf_user"],
-            password=config_dict["sf_password"],
-            account=config_dict["sf_account"],
-            warehouse=config_dict["sf_warehouse"],
-            database=config_dict["sf_database"],
-            schema=config_dict["sf_schema"]
-        )
+        conn = get_shared_snowflake_connection(config_dict)
         cursor = conn.cursor()
 
-        raw_table_fqn = f"{config_dict['sf_database']}.{config_dict['sf_schema']}.{config_dict['sf_raw_table']}"
-        query = f"""
-            SELECT COUNT(*) FROM {raw_table_fqn}
-            WHERE filename LIKE %(pattern)s
-        """
+        query = _prefix_count_sql(config_dict["sf_database"], config_dict["sf_schema"], config_dict["sf_raw_table"])
         cursor.execute(query, {"pattern": f"{sf_col_pattern}%"})
         row = cursor.fetchone()
         return row[0] if row else 0
@@ -86,7 +78,6 @@ def get_sf_count_from_snowflake(config_dict: dict, sf_col_pattern: str) -> int:
     finally:
         try:
             cursor.close()
-            conn.close()
         except:
             pass
 
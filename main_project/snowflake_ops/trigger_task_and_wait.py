@@ -1,10 +1,42 @@
-import snowflake.connector
 import time
+from functools import lru_cache
+from main_project.utils.snowflake_connect import get_shared_snowflake_connection
+
+@lru_cache(maxsize=8)
+def _task_statements(database: str, schema: str, task_name: str) -> tuple:
+    # (task_fqn, EXECUTE TASK text, TASK_HISTORY poll text), built once per task
+    task_fqn = f"{database}.{schema}.{task_name}"
+    history_sql = f"""
+            SELECT state, error_message
+            FROM TABLE({database}.INFORMATION_SCHEMA.TASK_HISTORY(
+                TASK_NAME => %(task_name)s,
+                SCHEDULED_TIME_RANGE_START => %(since)s::TIMESTAMP_LTZ
+            ))
+            WHERE schema_name = %(schema)s
+              AND state IN ('SUCCEEDED', 'FAILED', 'FAILED_AND_AUTO_SUSPENDED', 'CANCELLED', 'SKIPPED')
+            ORDER BY scheduled_time DESC
+            LIMIT 1
+        """
+    return task_fqn, f"EXECUTE TASK {task_fqn}", history_sql
+
+
+def _backoff_delays(first_sec=1.0, factor=1.5, cap_sec=30.0):
+    # 1s, 1.5s, 2.25s, ... capped at 30s between polls
+    delay = first_sec
+    while True:
+        yield delay
+        delay = min(delay * factor, cap_sec)
+
 
 def trigger_snowflake_task_and_wait(config_dict):
     """
     Triggers a Snowflake task that loads data from S3 using Snowpipe and waits for ingestion to complete.
 
+    EXECUTE TASK is submitted asynchronously and polled until Snowflake accepts it;
+    TASK_HISTORY is then polled with exponential backoff until the run it started
+    finishes. wait_time_sec is the upper bound on the whole wait rather than a
+    fixed pause, so the pipeline moves on as soon as the load is done.
+
     Args:
         config_dict (dict): Dictionary containing Snowflake credentials and wait settings.
             Required keys:
@@ -16,29 +48,57 @@ def trigger_snowflake_task_and_wait(config_dict):
                 - sf_schema
                 - task_name
                 - wait_time_sec (default fallback)
+
+    Raises:
+        Exception: If the task could not be triggered or its run did not succeed.
     """
-    task_fqn = f"{config_dict['sf_database']}.{config_dict['sf_schema']}.{config_dict['task_name']}"
+    database = config_dict["sf_database"]
+    schema = config_dict["sf_schema"]
+    task_name = config_dict["task_name"]
+    task_fqn, execute_sql, history_sql = _task_statements(database, schema, task_name)
     wait_time_sec = config_dict.get("wait_time_sec", 60)
 
     try:
-        task_name = config_dict["task"]
-        conn = snowflake.connector.connect(
-            user=config_dict["sf_user"],
-            password=config_dict["sf_password"],
-            account=config_dict["sf_account"],
-            warehouse=config_dict["sf_warehouse"],
-            database=config_dict["sf_audit_database"],
-            schema=config_dict["sf_audit_schema"]
-        )
+        # The task is addressed by its fully qualified name, so the shared
+        # connection's default database/schema don't matter here
+        conn = get_shared_snowflake_connection(config_dict)
         cursor = conn.cursor()
+        deadline = time.monotonic() + wait_time_sec
+        delays = _backoff_delays()
+
+        # Runs scheduled from this point on belong to this trigger (server clock)
+        cursor.execute("SELECT CURRENT_TIMESTAMP()")
+        triggered_at = cursor.fetchone()[0]
 
         # Trigger the Snowflake task
         print(f"[INFO] Triggering Snowflake task: {task_fqn}")
-        query = f"EXECUTE TASK {database}.{schema}.{task_name}"
-        cursor.execute(query)
+        cursor.execute_async(execute_sql)
+        query_id = cursor.sfqid
+        while conn.is_still_running(conn.get_query_status_throw_if_error(query_id)):
+            time.sleep(next(delays))
+
+        print(f"[INFO] Waiting up to {wait_time_sec} seconds for the task run to finish ingestion via Snowpipe...")
+        history_params = {
+            "task_name": task_name.upper(),
+            "since": triggered_at,
+            "schema": schema.upper()
+        }
+        while True:
+            cursor.execute(history_sql, history_params)
+            row = cursor.fetchone()
+            if row is not None:
+                state, error_message = row
+                # Anything but SUCCEEDED (including a SKIPPED run) means this load didn't happen
+                if state != "SUCCEEDED":
+                    raise Exception(f"Task run {state}: {error_message}")
+                print(f"[INFO] Snowflake task run succeeded: {task_fqn}")
+                break
 
-        print(f"[INFO] Waiting for {wait_time_sec} seconds to allow data ingestion via Snowpipe...")
-        time.sleep(wait_time_sec)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"[WARN] Task run not finished after {wait_time_sec}s; continuing.")
+                break
+            time.sleep(min(next(delays), remaining))
 
     except Exception as e:
         print(f"[ERROR] Failed to trigger Snowflake task or wait: {e}")
@@ -47,6 +107,5 @@ def trigger_snowflake_task_and_wait(config_dict):
     finally:
         try:
             cursor.close()
-            conn.close()
         except:
             pass
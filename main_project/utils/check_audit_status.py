@@ -1,4 +1,20 @@
-from main_project.utils.snowflake_connect import create_snowflake_connection
+from functools import lru_cache
+
+from main_project.utils.snowflake_connect import get_shared_snowflake_connection
+
+@lru_cache(maxsize=8)
+def _status_query(database: str, schema: str, table: str) -> str:
+    return f"""
+            SELECT status
+            FROM {database}.{schema}.{table}
+            WHERE pipeline_name = %(pipeline_name)s
+              AND index_name = %(index_name)s
+              AND query_windows_start_ts = %(query_windows_start_ts)s
+              AND query_windows_end_ts = %(query_windows_end_ts)s
+            ORDER BY rec_last_updated_ts DESC
+            LIMIT 1
+        """
+
 
 def check_audit_status(input_dict: dict) -> str:
     """
@@ -16,25 +32,10 @@ def check_audit_status(input_dict: dict) -> str:
         str: Most recent status from audit table or None if not found.
     """
     try:
-        conn = create_snowflake_connection(input_dict)
+        conn = get_shared_snowflake_connection(input_dict)
         cursor = conn.cursor()
 
-        fully_qualified_table_name = (
-            f"{input_dict['sf_database']}."
-            f"{input_dict['sf_schema']}."
-            f"{input_dict['audit_table']}"
-        )
-
-        query = f"""
-            SELECT status
-            FROM {fully_qualified_table_name}
-            WHERE pipeline_name = %(pipeline_name)s
-              AND index_name = %(index_name)s
-              AND query_windows_start_ts = %(query_windows_start_ts)s
-              AND query_windows_end_ts = %(query_windows_end_ts)s
-            ORDER BY rec_last_updated_ts DESC
-            LIMIT 1
-        """
+        query = _status_query(input_dict["sf_database"], input_dict["sf_schema"], input_dict["audit_table"])
 
         cursor.execute(query, {
             "pipeline_name": input_dict["pipeline_name"],
@@ -53,6 +54,5 @@ def check_audit_status(input_dict: dict) -> str:
     finally:
         try:
             cursor.close()
-            conn.close()
         except:
             pass
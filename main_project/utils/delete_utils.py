@@ -1,5 +1,14 @@
+from functools import lru_cache
+
 import boto3
-import snowflake.connector
+from main_project.utils.snowflake_connect import get_shared_snowflake_connection
+
+@lru_cache(maxsize=8)
+def _prefix_delete_sql(database: str, schema: str, table: str) -> str:
+    return f"""
+            DELETE FROM {database}.{schema}.{table}
+            WHERE filename LIKE %(pattern)s
+        """
 
 def delete_snowflake_records(sf_config: dict, filename_prefix: str):
     """
@@ -9,27 +18,23 @@ def delete_snowflake_records(sf_config: dict, filename_prefix: str):
         sf_config (dict): Includes Snowflake credentials and raw table name
         filename_prefix (str): Prefix pattern to delete (e.g., 'index_name/yyyy-mm-dd/hh-mm/')
     """
-    table_fqn = f"{sf_config['sf_database']}.{sf_config['sf_schema']}.{sf_config['sf_raw_table']}"
-    conn = snowflake.connector.connect(
-        user=sf_config["sf_user"],
-        password=sf_config["sf_password"],
-        account=sf_config["sf_account"],
-        warehouse=sf_config["sf_warehouse"],
-        database=sf_config["sf_database"],
-        schema=sf_config["sf_schema"]
-    )
+    conn = get_shared_snowflake_connection(sf_config)
+    cursor = conn.cursor()
     try:
-        cursor = conn.cursor()
-        delete_sql = f"""
-            DELETE FROM {table_fqn}
-            WHERE filename LIKE %(pattern)s
-        """
+        delete_sql = _prefix_delete_sql(sf_config["sf_database"], sf_config["sf_schema"], sf_config["sf_raw_table"])
         cursor.execute(delete_sql, {"pattern": f"{filename_prefix}%"})
-        conn.commit()
         print(f"[INFO] Deleted Snowflake records for prefix: {filename_prefix}")
     finally:
         cursor.close()
-        conn.close()
+
+@lru_cache(maxsize=8)
+def _get_s3_client(aws_access_key_id: str, aws_secret_access_key: str):
+    # Client construction loads botocore service models; build it once per credential pair
+    return boto3.client(
+        "s3",
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key
+    )
 
 def delete_s3_file(aws_config: dict, s3_prefix: str):
     """
@@ -39,11 +44,7 @@ def delete_s3_file(aws_config: dict, s3_prefix: str):
         aws_config (dict): Includes aws_access_key_id, aws_secret_access_key, and s3_bucket
         s3_prefix (str): Full path to the S3 object (key)
     """
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=aws_config["aws_access_key_id"],
-        aws_secret_access_key=aws_config["aws_secret_access_key"]
-    )
+    s3 = _get_s3_client(aws_config["aws_access_key_id"], aws_config["aws_secret_access_key"])
     try:
         s3.delete_object(Bucket=aws_config["s3_bucket"], Key=s3_prefix)
         print(f"[INFO] Deleted S3 file: s3://{aws_config['s3_bucket']}/{s3_prefix}")
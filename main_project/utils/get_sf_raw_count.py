@@ -1,4 +1,14 @@
-import snowflake.connector
+from functools import lru_cache
+
+from main_project.utils.snowflake_connect import get_shared_snowflake_connection
+
+@lru_cache(maxsize=8)
+def _raw_count_query(database: str, schema: str, table: str) -> str:
+    return f"""
+            SELECT COUNT(*)
+            FROM {database}.{schema}.{table}
+            WHERE filename LIKE %(pattern)s
+        """
 
 def get_snowflake_raw_count(info_dict: dict, sf_col_pattern: str) -> int:
     """
@@ -6,7 +16,7 @@ def get_snowflake_raw_count(info_dict: dict, sf_col_pattern: str) -> int:
 
     Args:
         info_dict (dict): Snowflake connection and table info. Must include:
-            - sf_username
+            - sf_user
             - sf_password
             - sf_account
             - sf_warehouse
@@ -19,24 +29,11 @@ def get_snowflake_raw_count(info_dict: dict, sf_col_pattern: str) -> int:
         int: Count of records matching the filename pattern. Returns None if no result or query fails.
     """
     try:
-        table_fqn = f"{info_dict['sf_database']}.{info_dict['sf_schema']}.{info_dict['sf_raw_table']}"
-
-        conn = snowflake.connector.connect(
-            user=info_dict["sf_username"],
-            password=info_dict["sf_password"],
-            account=info_dict["sf_account"],
-            warehouse=info_dict["sf_warehouse"],
-            database=info_dict["sf_database"],
-            schema=info_dict["sf_schema"]
-        )
+        conn = get_shared_snowflake_connection(info_dict)
         cursor = conn.cursor()
 
-        query = f"""
-            SELECT COUNT(*) 
-            FROM {table_fqn}
-            WHERE filename LIKE '{sf_col_pattern}%'
-        """
-        cursor.execute(query)
+        query = _raw_count_query(info_dict["sf_database"], info_dict["sf_schema"], info_dict["sf_raw_table"])
+        cursor.execute(query, {"pattern": f"{sf_col_pattern}%"})
         row = cursor.fetchone()
 
         return row[0] if row else None
@@ -48,6 +45,5 @@ def get_snowflake_raw_count(info_dict: dict, sf_col_pattern: str) -> int:
     finally:
         try:
             cursor.close()
-            conn.close()
         except:
             pass
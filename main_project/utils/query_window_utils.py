@@ -1,6 +1,7 @@
 # utils/query_window_utils.py
 
-import pendulum
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
 def get_query_window_timestamps(timezone_str: str = "UTC") -> dict:
     """
@@ -17,13 +18,20 @@ def get_query_window_timestamps(timezone_str: str = "UTC") -> dict:
         }
     """
     try:
-        tz = pendulum.timezone(timezone_str)
+        # ZoneInfo keeps its own per-key instance cache, so repeat lookups are cheap
+        tz = ZoneInfo(timezone_str)
     except Exception:
         raise ValueError(f"Invalid timezone string provided: {timezone_str}")
 
-    now = pendulum.now(tz)
-    start_of_day = now.start_of("day").to_iso8601_string()
-    end_of_day = now.end_of("day").to_iso8601_string()
+    now = datetime.now(tz)
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999).isoformat()
+
+    # Keep the "Z" suffix the window strings have always carried for UTC, so they
+    # still match the audit rows written before
+    if timezone_str == "UTC":
+        start_of_day = start_of_day.replace("+00:00", "Z")
+        end_of_day = end_of_day.replace("+00:00", "Z")
 
     return {
         "query_windows_start_ts": start_of_day,
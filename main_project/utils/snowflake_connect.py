@@ -1,5 +1,16 @@
+import time
+import atexit
+import threading
+
 import snowflake.connector
 
+_LOCK = threading.Lock()
+_SHARED_CONNECTIONS = {}
+# key -> monotonic time the shared connection was last handed out
+_LAST_USED = {}
+# A connection handed out more recently than this is reused without a probe query
+_IDLE_PROBE_SECS = 300
+
 def create_snowflake_connection(input_dict: dict):
     """
     Establishes a Snowflake connection using credentials from input_dict.
@@ -18,5 +29,69 @@ def create_snowflake_connection(input_dict: dict):
         account=input_dict["sf_account"],
         warehouse=input_dict["sf_warehouse"],
         database=input_dict["sf_database"],
-        schema=input_dict["sf_schema"]
+        schema=input_dict["sf_schema"],
+        client_session_keep_alive=True,
+        # Each DML statement commits itself, so writers skip a separate COMMIT round trip
+        autocommit=True
+    )
+
+
+def _is_healthy(conn, idle_secs: float) -> bool:
+    if conn.is_closed():
+        return False
+    if idle_secs < _IDLE_PROBE_SECS:
+        return True
+    # Only a connection that sat idle pays the SELECT 1 round trip
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+def get_shared_snowflake_connection(input_dict: dict):
+    """
+    Returns a process-wide Snowflake connection for the given credentials, opening it on first use.
+
+    The connection is re-opened if it has been closed. Only after it has sat idle
+    for _IDLE_PROBE_SECS is it probed with SELECT 1 first, so back-to-back helpers
+    reuse it without an extra round trip. Callers should close their cursors but
+    must NOT close the connection; it is closed on interpreter shutdown.
+
+    Parameters:
+        input_dict (dict): Same keys as create_snowflake_connection.
+
+    Returns:
+        snowflake.connector.connection.SnowflakeConnection: A live, shared connection object.
+    """
+    key = (
+        input_dict["sf_account"],
+        input_dict["sf_user"],
+        input_dict["sf_warehouse"],
+        input_dict["sf_database"],
+        input_dict["sf_schema"],
     )
+    with _LOCK:
+        now = time.monotonic()
+        conn = _SHARED_CONNECTIONS.get(key)
+        if conn is None or not _is_healthy(conn, now - _LAST_USED.get(key, now)):
+            conn = create_snowflake_connection(input_dict)
+            _SHARED_CONNECTIONS[key] = conn
+        _LAST_USED[key] = now
+        return conn
+
+
+@atexit.register
+def close_shared_snowflake_connections():
+    with _LOCK:
+        for conn in _SHARED_CONNECTIONS.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        _SHARED_CONNECTIONS.clear()
+        _LAST_USED.clear()